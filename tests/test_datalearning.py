@@ -18,6 +18,11 @@ def test_spectral_image():
 
     start = torch.randn(1, 3, 128, 128)
     pi = SpectralImage((1, 3, 128, 128), init_img=start)
+    assert start.allclose(pi(), atol=1e-5)
+
+    start = torch.randn(1, 3, 63, 65)
+    pi = SpectralImage((1, 3, 63, 65), init_img=start)
+    assert start.allclose(pi(), atol=1e-5)
 
 
 def test_correlate_colors():
@@ -28,7 +28,8 @@ def test_bn():
         m(torch.randn(5, 16, 8, 8), torch.randn(5, 8))
 
     m = torch.jit.script(PixelNorm())
-    m(torch.randn(5, 16, 8, 8))
+    out = m(torch.randn(5, 16, 8, 8))
+    assert out.pow(2).mean(dim=1).allclose(torch.ones(5, 8, 8), atol=1e-4)
 
     m = Lambda(lambda x: x + 1)
     m(torch.zeros(1))
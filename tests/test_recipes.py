@@ -1,14 +1,19 @@
+import pytest
 import torch
 import torchelie as tch
 import torch.nn as nn
 from torch.utils.data import DataLoader
 from torchvision.transforms import ToPILImage
 
+from torchelie.recipes import Recipe
 from torchelie.recipes import CrossEntropyClassification
+from torchelie.recipes import MixupClassification
 from torchelie.recipes import DeepDream
 from torchelie.recipes import FeatureVis
 from torchelie.recipes import NeuralStyle
 from torchelie.recipes import TrainAndCall
+from torchelie.recipes import TrainAndTest
+from torchelie.recipes.trainandtest import _cuda_graphed
 import torchelie.callbacks as tcb
 
 
@@ -21,6 +26,8 @@ class FakeData:
         return torch.randn(10) + cls * 3, cls
 
 class FakeImg:
+    classes = ['foo', 'bar']
+
     def __len__(self):
         return 10
 
@@ -39,6 +46,146 @@ def test_classification():
     ['foo', 'bar'])
     clf_recipe.run(1)
 
+    clf_recipe = CrossEntropyClassification(model, trainloader, testloader,
+    ['foo', 'bar'], mixed_precision=True)
+    clf_recipe.run(1)
+
+    clf_recipe = CrossEntropyClassification(model, trainloader, testloader,
+    ['foo', 'bar'], accumulation=2)
+    clf_recipe.run(1)
+
+    clf_recipe = CrossEntropyClassification(model, trainloader, testloader,
+    ['foo', 'bar'], cuda_graph=True)
+    clf_recipe.run(1)
+
+
+def test_mixup_classification():
+    from torchelie.datasets import MixUpDataset
+    trainloader = DataLoader(MixUpDataset(FakeImg()), 4, shuffle=True)
+    testloader = DataLoader(FakeImg(), 4, shuffle=True)
+
+    model = nn.Sequential(tch.nn.Reshape(-1), nn.Linear(16, 2))
+
+    clf_recipe = MixupClassification(model, trainloader, testloader,
+    ['foo', 'bar'], mixed_precision=True, accumulation=2)
+    clf_recipe.run(1)
+
+
+@pytest.mark.skipif(not torch.cuda.is_available(), reason='needs CUDA')
+def test_recipe_cuda_prefetch():
+    data = torch.arange(40 * 16, dtype=torch.float).view(40, 16)
+    loader = DataLoader(torch.utils.data.TensorDataset(data),
+                        4,
+                        pin_memory=True)
+
+    seen = []
+
+    def step(batch):
+        x, = batch
+        assert x.is_cuda
+        # enough work for the copy of the next batch to overlap with it
+        for _ in range(10):
+            x = x @ torch.eye(16, device=x.device)
+        seen.append(x)
+        return {}
+
+    recipe = Recipe(step, loader)
+    recipe.to('cuda')
+    recipe.run(2)
+
+    assert len(seen) == 20
+    for i, x in enumerate(seen):
+        expected = data[4 * (i % 10):4 * (i % 10 + 1)]
+        assert torch.equal(x.cpu(), expected)
+
+
+def test_trainandtest_cuda_graph_eager_fallback():
+    # On CPU, cuda_graph=True must fall back to calling test_fun eagerly and
+    # give the same test metrics as cuda_graph=False
+    def run(cuda_graph):
+        torch.manual_seed(0)
+        x = torch.randn(10, 10)
+        y = (torch.arange(10) >= 5).long()
+        data = torch.utils.data.TensorDataset(x + 3 * y[:, None], y)
+        model = nn.Linear(10, 2)
+        opt = torch.optim.SGD(model.parameters(), lr=0.1)
+
+        def train_step(batch):
+            x, y = batch
+            opt.zero_grad()
+            loss = torch.nn.functional.cross_entropy(model(x), y)
+            loss.backward()
+            opt.step()
+            return {'loss': loss}
+
+        def test_step(batch):
+            x, y = batch
+            return {'loss': torch.nn.functional.cross_entropy(model(x), y)}
+
+        recipe = TrainAndTest(model,
+                              train_step,
+                              test_step,
+                              DataLoader(data, 4),
+                              DataLoader(data, 4),
+                              test_every=2,
+                              visdom_env=None,
+                              checkpoint=None,
+                              cuda_graph=cuda_graph)
+        recipe.run(2)
+        return recipe.test_loop.callbacks.state['loss']
+
+    assert torch.equal(run(True), run(False))
+
+
+@pytest.mark.skipif(not torch.cuda.is_available(), reason='needs CUDA')
+def test_cuda_graphed_matches_eager():
+    model = nn.Sequential(nn.Linear(10, 32), nn.ReLU(), nn.Linear(32, 2))
+    model.cuda().eval()
+
+    def test_step(batch):
+        x, y = batch
+        pred = model(x)
+        return {'pred': pred,
+                'loss': torch.nn.functional.cross_entropy(pred, y)}
+
+    graphed = _cuda_graphed(test_step)
+    # 10 samples by 4: the last batch is short and must run eagerly
+    loader = DataLoader(FakeData(), 4, pin_memory=True)
+    with torch.no_grad():
+        for _ in range(3):
+            for x, y in loader:
+                batch = (x.cuda(non_blocking=True), y.cuda(non_blocking=True))
+                ref = test_step(batch)
+                out = graphed(batch)
+                assert torch.allclose(ref['pred'], out['pred'], atol=1e-6)
+                assert torch.allclose(ref['loss'], out['loss'], atol=1e-6)
+
+
+@pytest.mark.skipif(not torch.cuda.is_available(), reason='needs CUDA')
+def test_compiled_cuda_graphed_matches_eager():
+    from torchelie.recipes.classification import _compile
+    model = nn.Sequential(nn.Linear(10, 32), nn.ReLU(), nn.Linear(32, 2))
+    model.cuda().eval()
+    compiled = _compile(model, cuda_graph=True)
+
+    graphed = _cuda_graphed(lambda batch: {'pred': compiled(batch[0])})
+    loader = DataLoader(FakeData(), 4, pin_memory=True)
+    with torch.no_grad():
+        for _ in range(3):
+            for x, y in loader:
+                x = x.cuda(non_blocking=True)
+                out = graphed((x, y.cuda(non_blocking=True)))
+                assert torch.allclose(model(x), out['pred'], atol=1e-5)
+
+    trainloader = DataLoader(FakeData(), 4, shuffle=True, pin_memory=True)
+    testloader = DataLoader(FakeData(), 4, pin_memory=True)
+    model = nn.Linear(10, 2)
+    clf_recipe = CrossEntropyClassification(model, trainloader, testloader,
+    ['foo', 'bar'], compile_model=True, cuda_graph=True, test_every=2,
+    visdom_env=None)
+    clf_recipe.to('cuda')
+    clf_recipe.run(2)
+
 
 def test_deepdream():
     model = nn.Sequential(nn.Conv2d(3, 6, 3))
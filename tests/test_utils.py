@@ -15,6 +15,11 @@ def test_net():
     assert layer_by_name(torch.nn.Sequential(m), 'test') is None
     send_to_device([{'a': [m]}], 'cpu')
 
+    x = [{'a': torch.zeros(2)}, (torch.ones(1), 3)]
+    assert len(list(iter_tensors(x))) == 2
+    y = map_tensors(x, lambda t: t + 1)
+    assert y[0]['a'].eq(1).all() and isinstance(y[1], tuple) and y[1][1] == 3
+
     fm = FrozenModule(m)
     fm.train()
     assert not fm.weight.requires_grad
@@ -24,6 +29,19 @@ def test_net():
     fm.weight
 
 
+def test_fuse_conv_bn():
+    from torchelie.nn import Conv2dBNReLU
+    m = Conv2dBNReLU(4, 8, 3)
+    m.norm.running_mean.normal_()
+    m.norm.running_var.uniform_(0.5, 2)
+    m.eval()
+    x = torch.randn(2, 4, 8, 8)
+    ref = m(x)
+    fuse_conv_bn(m)
+    assert isinstance(m.norm, torch.nn.Identity)
+    assert ref.allclose(m(x), atol=1e-5)
+
+
 def test_utils():
     entropy(torch.randn(1, 10))
     gram(torch.randn(4, 10))
@@ -198,7 +198,7 @@ class Optimizer(tu.AutoStateDict):
 
     Args:
         opt (Optimizer): the optimizer to use
-        accumulations (int): number of batches to accumulate gradients over
+        accumulation (int): number of batches to accumulate gradients over
         clip_grad_norm (float or None): maximal norm of gradients to clip,
             before applying :code:`opt.step()`
         log_lr (bool): whether to log the current learning rates in the metrics
@@ -221,7 +221,7 @@ class Optimizer(tu.AutoStateDict):
 
     def on_batch_start(self, state):
         if state['iters'] % self.accumulation == 0:
-            self.opt.zero_grad()
+            self.opt.zero_grad(set_to_none=True)
 
         if self.log_lr:
             for i in range(len(self.opt.param_groups)):
@@ -242,7 +242,6 @@ class Optimizer(tu.AutoStateDict):
                 for pg in self.opt.param_groups:
                     for p in pg['params']:
                         if p.grad is not None:
-                            print('g', p.grad.abs().mean().item())
                             p.grad.data /= self.accumulation
             if self.clip_grad_norm is not None:
                 state['metrics']['grad_norm'] = torch.nn.utils.clip_grad_norm_(
@@ -1,12 +1,14 @@
+import math
+
 import numpy as np
 import torch
 import torch.nn as nn
 
 
 def _rfft2d_freqs(h, w):
-    fy = np.fft.fftfreq(h)[:, None]
-    fx = np.fft.fftfreq(w)[:w // 2 + (1 if w % 2 == 0 else 2)]
-    return np.sqrt(fx * fx + fy * fy)
+    fy = torch.fft.fftfreq(h).view(-1, 1)
+    fx = torch.fft.fftfreq(w)[:w // 2 + 1]
+    return torch.sqrt(fx * fx + fy * fy)
 
 
 class PixelImage(nn.Module):
@@ -35,7 +37,8 @@ class PixelImage(nn.Module):
 
     def forward(self):
         """
-        Return the image
+        Return the image. This is the learnable parameter itself, not a copy:
+        it must not be modified in place.
         """
         return self.pixels
 
@@ -68,20 +71,19 @@ class SpectralImage(nn.Module):
         spectrum_var = torch.nn.Parameter(init_val)
         self.spectrum_var = spectrum_var
 
-        spertum_scale = 1.0 / np.maximum(freqs,
-                                         1.0 / max(h, w))**self.decay_power
-        spertum_scale *= np.sqrt(w * h)
-        spertum_scale = torch.FloatTensor(spertum_scale).unsqueeze(-1)
+        # the / 4 of the output image is folded in the scale
+        spertum_scale = torch.clamp(freqs, min=1.0 / max(h, w)).pow(
+            -self.decay_power) * (math.sqrt(w * h) / 4.)
         self.register_buffer('spertum_scale', spertum_scale)
 
         if init_img is not None:
             self.init_img(init_img)
 
     def init_img(self, init_img):
-        if init_img.shape[2] % 2 == 1:
-            init_img = nn.functional.pad(init_img, (1, 0, 0, 0))
-        fft = torch.rfft(init_img * 4, 2, onesided=True, normalized=False)
-        self.spectrum_var.data.copy_(fft / self.spertum_scale)
+        _, _, h, w = self.shape
+        fft = torch.fft.rfftn(init_img, s=(h, w),
+                              dim=(-2, -1)) / self.spertum_scale
+        self.spectrum_var.data.copy_(torch.view_as_real(fft))
 
     def forward(self):
         """
@@ -89,11 +91,12 @@ class SpectralImage(nn.Module):
         """
         n, ch, h, w = self.shape
 
-        scaled_spectrum = self.spectrum_var * self.spertum_scale
-        img = torch.irfft(scaled_spectrum, 2, onesided=True, normalized=False)
-
-        img = img[:, :ch, :h, :w]
-        return img / 4.
+        scaled_spectrum = (torch.view_as_complex(self.spectrum_var) *
+                           self.spertum_scale)
+        return torch.fft.irfftn(scaled_spectrum,
+                                s=(h, w),
+                                dim=(-2, -1),
+                                norm='backward')
 
 
 class CorrelateColors(torch.nn.Module):
@@ -118,19 +121,14 @@ class CorrelateColors(torch.nn.Module):
         """
         Correlate the color of the image `t` and return the result
         """
-        t_flat = t.view(t.shape[0], 3, -1).transpose(2, 1)
-        t_flat = torch.matmul(t_flat, self.color_correlation.t())
-        t = t_flat.transpose(2, 1).view(t.shape)
-        return t
+        return torch.einsum('nchw,kc->nkhw', t, self.color_correlation)
 
     def invert(self, t):
         """
         Decorrelate the color of the image `t` and return the result
         """
-        t_flat = t.view(t.shape[0], 3, -1).transpose(2, 1)
-        t_flat = torch.matmul(t_flat, self.color_correlation.inverse().t()[None])
-        t = t_flat.transpose(2, 1).view(t.shape)
-        return t
+        return torch.einsum('nchw,kc->nkhw', t,
+                            self.color_correlation.inverse())
 
 
 class RGB:
@@ -192,7 +190,7 @@ class ParameterizedImg(nn.Module):
         Return the tensor
         """
         t = self.color(self.img())
-        return torch.sigmoid(t)+0.01*t
+        return torch.add(torch.sigmoid(t), t, alpha=0.01)
 
     def render(self):
         """
@@ -30,7 +30,7 @@ class MBConv(nn.Module):
             nn.BatchNorm2d(hid),
             tnn.HardSwish(),
             tnn.SEBlock(hid, reduction=4),
-            tu.xavier(tnn.Conv1x1(hid, out_ch)),
+            tu.xavier(tnn.Conv1x1(hid, out_ch, bias=False)),
             nn.BatchNorm2d(out_ch)
         )
 
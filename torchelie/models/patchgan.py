@@ -15,7 +15,12 @@ def base_patch_discr(arch, in_ch=3, out_ch=1, norm=None):
             ]
         else:
             return [
-                kaiming(nn.Conv2d(in_ch, out_ch, 4, stride=2, padding=1),
+                kaiming(nn.Conv2d(in_ch,
+                                  out_ch,
+                                  4,
+                                  stride=2,
+                                  padding=1,
+                                  bias=False),
                         a=0.2),
                 norm(out_ch),
                 nn.LeakyReLU(0.2, inplace=True)
@@ -6,7 +6,7 @@ import torch.nn as nn
 import torchelie.nn as tnn
 import torchelie.utils as tu
 
-from typing import List, Callable
+from typing import List, Callable, Tuple
 from typing_extensions import Protocol
 
 from .classifier import Classifier, Classifier1
@@ -17,7 +17,7 @@ class BlockBuilder(Protocol):
         ...
 
 
-def VectorCondResNetBone(arch: List[str],
+def VectorCondResNetBone(arch: List[Tuple[int, int]],
                          head: nn.Module,
                          hidden: int,
                          head_ch: int,
@@ -53,7 +53,7 @@ def VectorCondResNetDebug(vector_size, in_ch=3, debug=False):
         a resnet instance
     """
     return VectorCondResNetBone(
-        ['64:1', '64:1', '128:2', '128:1', '256:2', '256:1'],
+        [(64, 1), (64, 1), (128, 2), (128, 1), (256, 2), (256, 1)],
         tnn.Conv2d(in_ch, 64, 3),
         vector_size,
         64,
@@ -76,7 +76,7 @@ class ClassCondResNetBone(nn.Module):
         A Resnet instance
     """
     def __init__(self,
-                 arch: List[str],
+                 arch: List[Tuple[int, int]],
                  head: nn.Module,
                  hidden: int,
                  num_classes: int,
@@ -109,7 +109,7 @@ def ClassCondResNetDebug(num_classes, num_cond_classes, in_ch=3, debug=False):
     """
     return Classifier(
         ClassCondResNetBone(
-            ['64:1', '64:1', '128:2', '128:1', '256:2', '256:1'],
+            [(64, 1), (64, 1), (128, 2), (128, 1), (256, 2), (256, 1)],
             tnn.Conv2dBNReLU(in_ch, 64, ks=7, stride=2),
             32,
             num_cond_classes,
@@ -119,7 +119,7 @@ def ClassCondResNetDebug(num_classes, num_cond_classes, in_ch=3, debug=False):
 
 def ResNetBone(head: nn.Module,
                head_ch: int,
-               arch: List[str],
+               arch: List[Tuple[int, int]],
                block: BlockBuilder,
                debug: bool = False) -> nn.Module:
     """
@@ -127,9 +127,9 @@ def ResNetBone(head: nn.Module,
 
     How to specify an architecture:
 
-    It's a list of block specifications. Each element is a string of the form
-    "output channels:stride". For instance "64:2" is a block with input stride
-    2 and 64 output channels.
+    It's a list of block specifications. Each element is a tuple of the form
+    (output channels, stride). For instance (64, 2) is a block with input
+    stride 2 and 64 output channels.
 
     Args:
         head (Module): head module at the start of the net
@@ -141,15 +141,12 @@ def ResNetBone(head: nn.Module,
     Returns:
         A Resnet instance
     """
-    def parse(l):
-        return [int(x) for x in l.split(':')]
-
     layers = [head]
 
     if debug:
         layers.append(tnn.Debug('Head'))
     in_ch = head_ch
-    for i, (ch, s) in enumerate(map(parse, arch)):
+    for i, (ch, s) in enumerate(arch):
         layers.append(block(in_ch, ch, stride=s))
         in_ch = ch
         if debug:
@@ -165,9 +162,9 @@ def PreactResNetBone(head, head_ch, arch, block, widen=1, debug=False):
 
     How to specify an architecture:
 
-    It's a list of block specifications. Each element is a string of the form
-    "output channels:stride". For instance "64:2" is a block with input stride
-    2 and 64 output channels.
+    It's a list of block specifications. Each element is a tuple of the form
+    (output channels, stride). For instance (64, 2) is a block with input
+    stride 2 and 64 output channels.
 
     Args:
         head (Module): head module at the start of the net
@@ -179,15 +176,12 @@ def PreactResNetBone(head, head_ch, arch, block, widen=1, debug=False):
     Returns:
         A Resnet instance
     """
-    def parse(l):
-        return [int(x) for x in l.split(':')]
-
     layers = [head]
 
     if debug:
         layers.append(tnn.Debug('Head'))
     in_ch = head_ch * widen
-    for i, (ch, s) in enumerate(map(parse, arch)):
+    for i, (ch, s) in enumerate(arch):
         ch *= widen
         layers.append(block(in_ch, ch, stride=s, first_layer=(i == 0)))
         in_ch = ch
@@ -214,7 +208,8 @@ def ResNetDebug(num_classes, in_ch=3, debug=False):
     """
     return Classifier(
         ResNetBone(tnn.Conv2dBNReLU(in_ch, 64, ks=7, stride=2),
-                   64, ['64:1', '64:1', '128:2', '128:1', '256:2', '256:1'],
+                   64, [(64, 1), (64, 1), (128, 2), (128, 1), (256, 2),
+                        (256, 1)],
                    tnn.ResBlock,
                    debug=debug), 256, num_classes)
 
@@ -233,7 +228,8 @@ def PreactResNetDebug(num_classes, in_ch=3, debug=False):
     """
     return Classifier(
         ResNetBone(tnn.Conv2dBNReLU(in_ch, 64, ks=5, stride=2),
-                   64, ['64:1', '64:1', '128:2', '128:1', '256:2', '256:1'],
+                   64, [(64, 1), (64, 1), (128, 2), (128, 1), (256, 2),
+                        (256, 1)],
                    tnn.PreactResBlock,
                    debug=debug), 256, num_classes)
 
@@ -241,8 +237,9 @@ def PreactResNetDebug(num_classes, in_ch=3, debug=False):
 def resnet20_cifar(num_classes, in_ch=3, debug=False):
     return Classifier1(ResNetBone(tnn.Conv2dBNReLU(in_ch, 16, ks=3, stride=1),
                                   16, [
-                                      '16:1', '16:1', '16:1', '32:2', '32:1',
-                                      '32:1', '64:2', '64:1', '64:1'
+                                      (16, 1), (16, 1), (16, 1), (32, 2),
+                                      (32, 1), (32, 1), (64, 2), (64, 1),
+                                      (64, 1)
                                   ],
                                   tnn.ResBlock,
                                   debug=debug),
@@ -267,8 +264,8 @@ def preact_resnet20_cifar(num_classes, in_ch=3, debug=False, **kwargs):
     return Classifier1(PreactResNetBone(
         tnn.Conv2d(in_ch, 16 * widen, ks=3),
         16, [
-            '16:1', '16:1', '16:1', '32:2', '32:1', '32:1', '64:2', '64:1',
-            '64:1'
+            (16, 1), (16, 1), (16, 1), (32, 2), (32, 1), (32, 1), (64, 2),
+            (64, 1), (64, 1)
         ],
         functools.partial(tnn.PreactResBlock, **kwargs),
         debug=debug,
@@ -282,7 +279,8 @@ def resnet18(num_classes, in_ch=3, debug=False):
     return Classifier1(ResNetBone(
         tnn.Conv2dBNReLU(3, 64, ks=7, stride=2),
         64,
-        ['64:1', '64:1', '128:2', '128:1', '256:2', '256:1', '512:2', '512:1'],
+        [(64, 1), (64, 1), (128, 2), (128, 1), (256, 2), (256, 1), (512, 2),
+         (512, 1)],
         tnn.ResBlock,
         debug=debug),
                        512,
@@ -295,7 +293,8 @@ def preact_resnet18(num_classes, in_ch=3, input_size=224, debug=False):
     return Classifier1(PreactResNetBone(
         head,
         64,
-        ['64:1', '64:1', '128:2', '128:1', '256:2', '256:1', '512:2', '512:1'],
+        [(64, 1), (64, 1), (128, 2), (128, 1), (256, 2), (256, 1), (512, 2),
+         (512, 1)],
         tnn.PreactResBlock,
         debug=debug),
                        512,
@@ -307,8 +306,8 @@ def preact_resnet34(num_classes, in_ch=3, input_size=224, debug=False):
     head = _preact_head(in_ch, 64, input_size)
     return Classifier1(PreactResNetBone(
         head,
-        64, ['64:1'] * 3 + ['128:2'] + ['128:1'] * 3 + ['256:2'] +
-        ['256:1'] * 5 + ['512:2', '512:1', '512:1'],
+        64, [(64, 1)] * 3 + [(128, 2)] + [(128, 1)] * 3 + [(256, 2)] +
+        [(256, 1)] * 5 + [(512, 2), (512, 1), (512, 1)],
         tnn.PreactResBlock,
         debug=debug),
                        512,
@@ -321,8 +320,8 @@ def preact_resnet26_reduce(num_classes, in_ch=3, input_size=224, debug=False):
     return Classifier1(PreactResNetBone(
         head,
         64, [
-            '64:1', '64:1', '128:2', '128:1', '256:2', '256:1', '512:2',
-            '512:1', '512:2', '512:1', '512:2', '512:1'
+            (64, 1), (64, 1), (128, 2), (128, 1), (256, 2), (256, 1), (512, 2),
+            (512, 1), (512, 2), (512, 1), (512, 2), (512, 1)
         ],
         tnn.PreactResBlock,
         debug=debug),
@@ -336,8 +335,8 @@ def preact_resnet18_exp(num_classes, in_ch=3, debug=False):
     return Classifier1(PreactResNetBone(
         head,
         64, [
-            '128:1', '128:1', '256:2', '256:1', '512:2', '512:1', '1024:2',
-            '1024:1'
+            (128, 1), (128, 1), (256, 2), (256, 1), (512, 2), (512, 1),
+            (1024, 2), (1024, 1)
         ],
         tnn.PreactResBlock,
         debug=debug),
@@ -89,7 +89,12 @@ def MConvNormReLU(in_ch, out_ch, ks, norm, center=True):
     Returns:
         A packed block with MaskedConv-Norm-ReLU as a CondSeq
     """
-    layers = [('conv', MaskedConv2d(in_ch, out_ch, ks, center=center))]
+    layers = [('conv',
+               MaskedConv2d(in_ch,
+                            out_ch,
+                            ks,
+                            center=center,
+                            bias=(1, 1) if norm is None else None))]
 
     if norm is not None:
         layers.append(('norm', norm(out_ch)))
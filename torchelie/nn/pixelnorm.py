@@ -5,4 +5,4 @@ class PixelNorm(torch.nn.Module):
     PixelNorm from ProgressiveGAN
     """
     def forward(self, x):
-        return x / (x.mean(dim=1, keepdim=True).sqrt() + 1e-8)
+        return x * torch.rsqrt(x.pow(2).mean(dim=1, keepdim=True) + 1e-8)
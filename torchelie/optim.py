@@ -249,8 +249,8 @@ class Lookahead(Optimizer):
         self.state = state['lookahead']
         self.optimizer.load_state_dict(state['opt'])
 
-    def zero_grad(self):
-        self.optimizer.zero_grad()
+    def zero_grad(self, set_to_none=True):
+        self.optimizer.zero_grad(set_to_none=set_to_none)
 
     def step(self, closure=None):
         """Performs a single optimization step.
@@ -22,6 +22,27 @@ from torchelie.recipes.trainandtest import TrainAndTest
 from torchelie.optim import RAdamW
 
 
+def _add_radamw(loop, model, lr, beta1, wd, accumulation=1):
+    opt = RAdamW(model.parameters(),
+                 lr=lr,
+                 betas=(beta1, 0.999),
+                 weight_decay=wd)
+    loop.callbacks.add_callbacks([
+        tcb.Optimizer(opt, accumulation=accumulation, log_lr=True),
+        tcb.LRSched(torch.optim.lr_scheduler.ReduceLROnPlateau(opt))
+    ])
+
+
+def _compile(model, cuda_graph):
+    # With cuda_graph, TrainAndTest captures the compiled forward in its own
+    # CUDA graph, and Inductor must not record graphs within that capture
+    if cuda_graph:
+        mode = 'max-autotune-no-cudagraphs'
+    else:
+        mode = 'max-autotune'
+    return torch.compile(model, mode=mode, dynamic=False)
+
+
 def Classification(model,
                    train_fun,
                    test_fun,
@@ -32,7 +53,8 @@ def Classification(model,
                    visdom_env=None,
                    checkpoint=None,
                    test_every=1000,
-                   log_every=100):
+                   log_every=100,
+                   cuda_graph=False):
     """
     Classification training and testing loop. Both forward functions must
     return a per-batch loss and logits predictions. It expands from
@@ -98,6 +120,8 @@ def Classification(model,
             1000)
         log_every (int): logging frequency, in number of iterations (default:
             100)
+        cuda_graph (bool): replay :code:`test_fun` from a CUDA graph, see
+            :code:`TrainAndTest` (default: False)
     """
 
     key_best = (lambda state: -state['test_loop']['callbacks']['state']
@@ -112,7 +136,8 @@ def Classification(model,
                         test_every=test_every,
                         log_every=log_every,
                         checkpoint=checkpoint,
-                        key_best=key_best)
+                        key_best=key_best,
+                        cuda_graph=cuda_graph)
 
     loop.callbacks.add_callbacks([
         tcb.AccAvg(),
@@ -157,7 +182,11 @@ def CrossEntropyClassification(model,
                                wd=1e-2,
                                visdom_env='main',
                                test_every=1000,
-                               log_every=100):
+                               log_every=100,
+                               mixed_precision=False,
+                               accumulation=1,
+                               compile_model=False,
+                               cuda_graph=False):
     """
     Extends Classification with default cross entropy forward passes. Also adds
     RAdamW and ReduceLROnPlateau.
@@ -208,19 +237,39 @@ def CrossEntropyClassification(model,
             1000)
         log_every (int): logging frequency, in number of iterations (default:
             1000)
+        mixed_precision (bool): run the forward passes under bfloat16
+            autocast (default: False)
+        accumulation (int): number of batches to accumulate gradients over
+            before each optimizer step (default: 1)
+        compile_model (bool): run the forward passes through
+            :code:`torch.compile(model)`. The uncompiled model is still the
+            one registered and checkpointed. Inductor's own CUDA graphs are
+            disabled when :code:`cuda_graph` is set (default: False)
+        cuda_graph (bool): replay the validation step from a CUDA graph, see
+            :code:`TrainAndTest` (default: False)
     """
 
+    forward = model
+    if compile_model:
+        forward = _compile(model, cuda_graph)
+
     def train_step(batch):
         x, y = batch
-        pred = model(x)
-        loss = torch.nn.functional.cross_entropy(pred, y)
+        with torch.autocast(x.device.type,
+                            dtype=torch.bfloat16,
+                            enabled=mixed_precision):
+            pred = forward(x)
+            loss = torch.nn.functional.cross_entropy(pred, y)
         loss.backward()
         return {'loss': loss, 'pred': pred}
 
     def validation_step(batch):
         x, y = batch
-        pred = model(x)
-        loss = torch.nn.functional.cross_entropy(pred, y)
+        with torch.autocast(x.device.type,
+                            dtype=torch.bfloat16,
+                            enabled=mixed_precision):
+            pred = forward(x)
+            loss = torch.nn.functional.cross_entropy(pred, y)
         return {'loss': loss, 'pred': pred}
 
     loop = Classification(model,
@@ -231,16 +280,10 @@ def CrossEntropyClassification(model,
                           classes,
                           visdom_env=visdom_env,
                           test_every=test_every,
-                          log_every=log_every)
+                          log_every=log_every,
+                          cuda_graph=cuda_graph)
 
-    opt = RAdamW(model.parameters(),
-                 lr=lr,
-                 betas=(beta1, 0.999),
-                 weight_decay=wd)
-    loop.callbacks.add_callbacks([
-        tcb.Optimizer(opt, log_lr=True),
-        tcb.LRSched(torch.optim.lr_scheduler.ReduceLROnPlateau(opt))
-    ])
+    _add_radamw(loop, model, lr, beta1, wd, accumulation=accumulation)
     return loop
 
 
@@ -254,7 +297,11 @@ def MixupClassification(model,
                                wd=1e-2,
                                visdom_env='main',
                                test_every=1000,
-                               log_every=100):
+                               log_every=100,
+                               mixed_precision=False,
+                               accumulation=1,
+                               compile_model=False,
+                               cuda_graph=False):
     """
     A Classification recipe with a default froward training / testing pass
     using cross entropy and mixup, and extended with RAdamW and
@@ -277,21 +324,41 @@ def MixupClassification(model,
             1000)
         log_every (int): logging frequency, in number of iterations (default:
             1000)
+        mixed_precision (bool): run the forward passes under bfloat16
+            autocast (default: False)
+        accumulation (int): number of batches to accumulate gradients over
+            before each optimizer step (default: 1)
+        compile_model (bool): run the forward passes through
+            :code:`torch.compile(model)`. The uncompiled model is still the
+            one registered and checkpointed. Inductor's own CUDA graphs are
+            disabled when :code:`cuda_graph` is set (default: False)
+        cuda_graph (bool): replay the validation step from a CUDA graph, see
+            :code:`TrainAndTest` (default: False)
     """
 
     from torchelie.loss import continuous_cross_entropy
 
+    forward = model
+    if compile_model:
+        forward = _compile(model, cuda_graph)
+
     def train_step(batch):
         x, y = batch
-        pred = model(x)
-        loss = continuous_cross_entropy(pred, y)
+        with torch.autocast(x.device.type,
+                            dtype=torch.bfloat16,
+                            enabled=mixed_precision):
+            pred = forward(x)
+            loss = continuous_cross_entropy(pred, y)
         loss.backward()
         return {'loss': loss}
 
     def validation_step(batch):
         x, y = batch
-        pred = model(x)
-        loss = torch.nn.functional.cross_entropy(pred, y)
+        with torch.autocast(x.device.type,
+                            dtype=torch.bfloat16,
+                            enabled=mixed_precision):
+            pred = forward(x)
+            loss = torch.nn.functional.cross_entropy(pred, y)
         return {'loss': loss, 'pred': pred}
 
     loop = TrainAndTest(model,
@@ -301,7 +368,8 @@ def MixupClassification(model,
                         test_loader,
                         visdom_env=visdom_env,
                         test_every=test_every,
-                        log_every=log_every)
+                        log_every=log_every,
+                        cuda_graph=cuda_graph)
 
     loop.callbacks.add_callbacks([
         tcb.WindowedMetricAvg('loss'),
@@ -329,14 +397,7 @@ def MixupClassification(model,
         tcb.MetricsTable(False)
     ])
 
-    opt = RAdamW(model.parameters(),
-                 lr=lr,
-                 betas=(beta1, 0.999),
-                 weight_decay=wd)
-    loop.callbacks.add_callbacks([
-        tcb.Optimizer(opt, log_lr=True),
-        tcb.LRSched(torch.optim.lr_scheduler.ReduceLROnPlateau(opt))
-    ])
+    _add_radamw(loop, model, lr, beta1, wd, accumulation=accumulation)
     return loop
 
 
@@ -362,6 +423,10 @@ if __name__ == '__main__':
     parser.add_argument('--no-cache', action='store_false')
     parser.add_argument('--epochs', type=int, default=5)
     parser.add_argument('--mixup', action='store_true')
+    parser.add_argument('--mixed-precision', action='store_true')
+    parser.add_argument('--accumulation', type=int, default=1)
+    parser.add_argument('--compile', action='store_true')
+    parser.add_argument('--cuda-graph', action='store_true')
     args = parser.parse_args()
 
     tfm = TF.Compose([
@@ -397,37 +462,43 @@ if __name__ == '__main__':
                              num_workers=8,
                              pin_memory=True,
                              shuffle=True,
-                             drop_last=True)
+                             drop_last=True,
+                             persistent_workers=True,
+                             prefetch_factor=4)
     testloader = DataLoader(testset,
                             args.batch_size,
                             num_workers=8,
-                            pin_memory=True)
+                            pin_memory=True,
+                            persistent_workers=True,
+                            prefetch_factor=4)
 
     model = tvmodels.resnet18(pretrained=False)
     model.fc = tu.kaiming(torch.nn.Linear(512, len(testset.classes)))
 
+    # Input shapes are fixed: let cuDNN pick the fastest algorithms, and use
+    # NHWC so that convolutions can run on tensor cores
+    torch.backends.cudnn.benchmark = True
+    model = model.to(memory_format=torch.channels_last)
+
     if args.mixup:
-        clf_recipe = MixupClassification(model,
-                                                trainloader,
-                                                testloader,
-                                                testset.classes,
-                                                log_every=10,
-                                                test_every=50,
-                                                lr=args.lr,
-                                                beta1=args.beta1,
-                                                wd=args.wd,
-                                                visdom_env=args.visdom_env)
+        recipe = MixupClassification
     else:
-        clf_recipe = CrossEntropyClassification(model,
-                                                trainloader,
-                                                testloader,
-                                                testset.classes,
-                                                log_every=10,
-                                                test_every=50,
-                                                lr=args.lr,
-                                                beta1=args.beta1,
-                                                wd=args.wd,
-                                                visdom_env=args.visdom_env)
+        recipe = CrossEntropyClassification
+
+    clf_recipe = recipe(model,
+                        trainloader,
+                        testloader,
+                        testset.classes,
+                        log_every=10,
+                        test_every=50,
+                        lr=args.lr,
+                        beta1=args.beta1,
+                        wd=args.wd,
+                        visdom_env=args.visdom_env,
+                        mixed_precision=args.mixed_precision,
+                        accumulation=args.accumulation,
+                        compile_model=args.compile,
+                        cuda_graph=args.cuda_graph)
 
     clf_recipe.to(args.device)
     clf_recipe.run(args.epochs)
@@ -68,10 +68,11 @@ def inpainting(img,
     mask = TFF.to_tensor(mask)[None].to(device)
     z = input_noise((im.shape[2], im.shape[3]), input_dim)
     z = z.to(device)
+    noise = torch.empty_like(z)
     print(hourglass)
 
     def body(batch):
-        recon = hourglass(z + torch.randn_like(z) * noise_std)
+        recon = hourglass(z + noise.normal_(0, noise_std))
         loss = torch.sum(
             F.mse_loss(F.interpolate(recon, size=im.shape[2:], mode='nearest'),
                        im,
@@ -112,9 +113,10 @@ def superres(img,
     im = TFF.to_tensor(img)[None].to(device)
     z = input_noise((im.shape[2] * scale, im.shape[3] * scale), input_dim)
     z = z.to(device)
+    noise = torch.empty_like(z)
 
     def body(batch):
-        recon = hourglass(z + torch.randn_like(z) * noise_std)
+        recon = hourglass(z + noise.normal_(0, noise_std))
         loss = F.mse_loss(
             F.interpolate(recon, size=im.shape[2:], mode='bilinear'), im)
         loss.backward()
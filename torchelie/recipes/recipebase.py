@@ -3,6 +3,44 @@ from collections import defaultdict, OrderedDict
 import torchelie.utils as tu
 
 
+def _prefetch_to_device(loader, device):
+    """
+    Iterate over :code:`(batch, batch_on_device)` pairs. On CUDA, the copy of
+    the next batch is issued on a side stream so that it overlaps with the
+    computations made on the current one.
+    """
+    device = torch.device(device)
+    if device.type != 'cuda':
+        for batch in loader:
+            yield batch, tu.send_to_device(batch, device, non_blocking=True)
+        return
+
+    copy_stream = torch.cuda.Stream(device)
+    compute_stream = torch.cuda.current_stream(device)
+
+    def send(batch):
+        with torch.cuda.stream(copy_stream):
+            return batch, tu.send_to_device(batch, device, non_blocking=True)
+
+    it = iter(loader)
+    try:
+        ready = send(next(it))
+    except StopIteration:
+        return
+
+    while ready is not None:
+        compute_stream.wait_stream(copy_stream)
+        for t in tu.iter_tensors(ready[1]):
+            if t.is_cuda:
+                t.record_stream(compute_stream)
+        current = ready
+        try:
+            ready = send(next(it))
+        except StopIteration:
+            ready = None
+        yield current
+
+
 class CallbacksRunner:
     def __init__(self):
         self.cbs = [[], [], []]
@@ -235,11 +273,10 @@ class Recipe(RecipeBase):
         self.to(self.device)
         for epoch in range(epochs):
             self.callbacks('on_epoch_start')
-            for batch in self.loader:
+            for batch, batch_gpu in _prefetch_to_device(
+                    self.loader, self.device):
                 self.callbacks.update_state({'batch': batch})
-                batch = tu.send_to_device(batch,
-                                          self.device,
-                                          non_blocking=True)
+                batch = batch_gpu
                 self.callbacks.update_state({'batch_gpu': batch})
 
                 self.callbacks('on_batch_start')
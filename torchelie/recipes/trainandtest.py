@@ -1,9 +1,67 @@
 import torch
 
 import torchelie.callbacks as tcb
+import torchelie.utils as tu
 from torchelie.recipes import Recipe
 
 
+def _cuda_graphed(fun):
+    """
+    Wrap :code:`fun` so that it is captured in a CUDA graph and replayed
+    afterwards. Only one graph is kept, for the shape of the first CUDA batch:
+
+    - the first call runs eagerly on a side stream, as a warmup
+    - the second call with the same shapes captures the graph, then replays it
+    - later calls with the same shapes only replay the graph, without running
+      :code:`fun`'s Python code
+    - batches of other shapes (such as a short last batch) or not entirely on
+      a CUDA device are processed eagerly
+    """
+    graph = {}
+
+    def graphed(batch):
+        tensors = list(tu.iter_tensors(batch))
+        if len(tensors) == 0 or not all(t.is_cuda for t in tensors):
+            return fun(batch)
+
+        key = tuple((t.shape, t.dtype, t.device) for t in tensors)
+        if 'key' not in graph:
+            graph['key'] = key
+            compute = torch.cuda.current_stream()
+            side = torch.cuda.Stream()
+            side.wait_stream(compute)
+            with torch.cuda.stream(side):
+                out = fun(batch)
+            compute.wait_stream(side)
+            for t in tu.iter_tensors(out):
+                if t.is_cuda:
+                    t.record_stream(compute)
+            return out
+
+        if key != graph['key']:
+            return fun(batch)
+
+        if 'graph' not in graph:
+            static_batch = [t.clone() for t in tensors]
+            batch_it = iter(static_batch)
+            static_in = tu.map_tensors(batch, lambda _: next(batch_it))
+
+            # thread_local: the DataLoader's pin memory thread keeps issuing
+            # CUDA calls while we capture
+            g = torch.cuda.CUDAGraph()
+            with torch.cuda.graph(g, capture_error_mode='thread_local'):
+                static_out = fun(static_in)
+            graph.update(graph=g, static_batch=static_batch, out=static_out)
+        else:
+            for dst, src in zip(graph['static_batch'], tensors):
+                dst.copy_(src, non_blocking=True)
+
+        graph['graph'].replay()
+        return graph['out']
+
+    return graphed
+
+
 def TrainAndTest(model,
                  train_fun,
                  test_fun,
@@ -14,7 +72,8 @@ def TrainAndTest(model,
                  visdom_env='main',
                  log_every=10,
                  checkpoint='model',
-                 key_best=None):
+                 key_best=None,
+                 cuda_graph=False):
     """
     Two nested loops, usually one for training and one for testing, but can
     serve other purposes. The model is automatically registered and
@@ -56,8 +115,19 @@ def TrainAndTest(model,
         checkpoint (str): checkpointing path or None for no checkpointing
         key_best (function or None): a key function for comparing states.
             Checkpointing the greatest.
+        cuda_graph (bool): capture :code:`test_fun` in a CUDA graph and replay
+            it, which removes kernel launch overhead when testing on CUDA.
+            Only the shape of the first test batch is captured, other shapes
+            run eagerly; the graph and its memory are kept as long as the
+            recipe lives. :code:`test_fun` must then be capturable: no host
+            synchronization, its Python side effects only happen in the first
+            two calls, and its outputs are overwritten by the next replay
+            (default: False)
     """
 
+    if cuda_graph:
+        test_fun = _cuda_graphed(test_fun)
+
     def eval_call(batch):
         model.eval()
         with torch.no_grad():
@@ -142,6 +142,37 @@ def layer_by_name(net, name):
             return l[1]
 
 
+def fuse_conv_bn(net):
+    """
+    Fold every BatchNorm2d that directly follows a Conv2d in a Sequential of
+    `net` into that conv's weights and bias, and replace the BatchNorm2d with
+    an identity. This is for inference only: `net` is put in eval mode, and
+    the folded BatchNorms cannot be trained anymore.
+
+    Args:
+        net (nn.Module): the module to fuse in place
+
+    Returns:
+        `net`
+    """
+    from torch.nn.utils.fusion import fuse_conv_bn_eval
+
+    net.eval()
+    for seq in net.modules():
+        if not isinstance(seq, nn.Sequential):
+            continue
+
+        names = list(seq._modules.keys())
+        for conv_name, bn_name in zip(names[:-1], names[1:]):
+            conv = seq._modules[conv_name]
+            bn = seq._modules[bn_name]
+            if (type(conv) is nn.Conv2d and type(bn) is nn.BatchNorm2d
+                    and bn.running_mean is not None):
+                seq._modules[conv_name] = fuse_conv_bn_eval(conv, bn)
+                seq._modules[bn_name] = nn.Identity()
+    return net
+
+
 def forever(iterable):
     """
     Cycle through `iterable` forever
@@ -217,36 +248,66 @@ def dict_by_key(d, k):
     return d
 
 
-def send_to_device(x, device, non_blocking=False):
+def iter_tensors(x):
     """
-    Send all tensors contained in `x` to `device`, when `x` is an arbitrary
+    Iterate over all tensors contained in `x`, when `x` is an arbitrary nested
+    datastructure of dicts and lists containing tensors
+
+    Args:
+        x: the tensors
+
+    Returns:
+        a generator over the tensors of `x`
+    """
+    if isinstance(x, torch.Tensor):
+        yield x
+    elif isinstance(x, (list, tuple)):
+        for xx in x:
+            yield from iter_tensors(xx)
+    elif isinstance(x, dict):
+        for xx in x.values():
+            yield from iter_tensors(xx)
+
+
+def map_tensors(x, fun):
+    """
+    Apply `fun` to all tensors contained in `x`, when `x` is an arbitrary
     nested datastructure of dicts and lists containing tensors
 
     Args:
         x: the tensors
-        device: a torch device
-        non_blocking (bool): non blocking
+        fun (Callable): a function taking a tensor and returning a new value
 
     Returns:
-        `x` with device changed
+        `x` with the same structure and `fun` applied to its tensors
     """
     if isinstance(x, torch.Tensor):
-        return x.to(device, non_blocking=non_blocking)
+        return fun(x)
     elif isinstance(x, list):
-        return [
-            send_to_device(xx, device, non_blocking=non_blocking) for xx in x
-        ]
+        return [map_tensors(xx, fun) for xx in x]
     elif isinstance(x, tuple):
-        return tuple(
-            send_to_device(xx, device, non_blocking=non_blocking) for xx in x)
+        return tuple(map_tensors(xx, fun) for xx in x)
     elif isinstance(x, dict):
-        return {
-            k: send_to_device(v, device, non_blocking=non_blocking)
-            for k, v in x.items()
-        }
+        return {k: map_tensors(v, fun) for k, v in x.items()}
     return x
 
 
+def send_to_device(x, device, non_blocking=False):
+    """
+    Send all tensors contained in `x` to `device`, when `x` is an arbitrary
+    nested datastructure of dicts and lists containing tensors
+
+    Args:
+        x: the tensors
+        device: a torch device
+        non_blocking (bool): non blocking
+
+    Returns:
+        `x` with device changed
+    """
+    return map_tensors(x, lambda t: t.to(device, non_blocking=non_blocking))
+
+
 def recursive_state_dict(x):
     """
     Recursively call state_dict() on all elements contained in a list / tuple /